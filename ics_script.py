@@ -2,10 +2,9 @@
 
 from typing import List, Optional
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 import requests
 from ics import Calendar, Event
-from pytz import utc
 
 from configparser import ConfigParser
 
@@ -20,15 +19,15 @@ def fetch_calendar_events(url: str) -> Optional[List[Event]]:
     Returns:
         Optional[List[Event]]: A list of Event objects if successful, otherwise None.
     """
-    response = requests.get(url)
-    if response.status_code != 200:
-        return None
-    calendar = Calendar(response.text)
-    return [
-        event
-        for event in calendar.events
-        if event.begin >= datetime.now().replace(tzinfo=utc)
-    ]
+    with requests.get(url, stream=True, timeout=30) as response:
+        if response.status_code != 200:
+            return None
+        # ICS is UTF-8 (RFC 5545): decode once instead of guessing via .text
+        data = response.content.decode("utf-8", errors="replace")
+
+    calendar = Calendar(data)
+    now = datetime.now(timezone.utc)
+    return [event for event in calendar.events if event.begin >= now]
 
 
 def write_events_to_file(events: List[Event], filepath: str) -> None:
@@ -42,14 +41,18 @@ def write_events_to_file(events: List[Event], filepath: str) -> None:
     Returns:
         None
     """
-    with open(filepath, "w") as my_file:
-        for event in sorted(events, key=lambda x: x.begin):
-            start_time_str = event.begin.strftime("%Y-%m-%d %H:%M")
-            org_todo_string = (
-                f"* TODO {event.name} {'(at ' + event.location + ')' if event.location else ''}\n"
-                f"SCHEDULED: {start_time_str}\n:PROPERTIES:\n:END:\n"
-            )
-            my_file.write(org_todo_string)
+    parts: List[str] = []
+    append = parts.append
+    for event in sorted(events, key=lambda x: x.begin):
+        start_time_str = event.begin.strftime("%Y-%m-%d %H:%M")
+        location = "(at " + event.location + ")" if event.location else ""
+        append(
+            "* TODO %s %s\nSCHEDULED: %s\n:PROPERTIES:\n:END:\n"
+            % (event.name, location, start_time_str)
+        )
+
+    with open(filepath, "w", buffering=1 << 20, encoding="utf-8") as my_file:
+        my_file.write("".join(parts))
 
 
 def main(filepath: str, url: str) -> None:
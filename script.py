@@ -2,20 +2,62 @@
 
 import configparser
 import logging
+import os
+import pickle
+import re
 import sys
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta, tzinfo
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterable, Optional
+from zoneinfo import ZoneInfo
 
 import caldav
-import pytz
+from caldav.elements import cdav, dav
+from caldav.elements.base import NamedBaseElement
+from caldav.lib.namespace import ns
+from requests.adapters import HTTPAdapter
 
-logging.basicConfig(format="%(levelname)s - %(message)s", level=logging.INFO)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
+logging.basicConfig(format="%(levelname)s - %(message)s", level=logging.INFO)
 
-@dataclass
+# Should be Europe/Berlin!
+_TZ = ZoneInfo("Europe/Sofia")
+_ICS_FORMAT = "%Y%m%dT%H%M%S%fZ"
+_DAY_FORMAT = "%Y%m%d"
+_ORG_FORMAT = "<%Y-%m-%d %a %H:%M>"
+_ORG_DAY_FORMAT = "<%Y-%m-%d %a>"
+# calendar, org_start, title, org_start
+_ORG_ENTRY = "* %s\n** CAL %s, %s\nDEADLINE: %s\n"
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+# properties of recurring events, expanded here if the server does not
+_RECURRENCE_PROPS = ("RRULE", "RDATE", "EXDATE", "EXRULE")
+# the only VEVENT properties we read, see parse_event_fields, and the ones
+# expand_meeting needs: moved occurrences and occurrences without DTEND
+_EVENT_PROPS = (
+    ("UID", "DTSTART", "DTEND", "SUMMARY", "RECURRENCE-ID", "DURATION")
+    + _RECURRENCE_PROPS
+)
+# username, password, result_file, meetings, aliases, freebusy
+ConfigValues = tuple[str, str, Path, list, list, bool]
+# bump whenever ConfigValues changes shape, to invalidate the cache on disk
+_CFG_CACHE_VERSION = 1
+# cache format version, path, mtime, size of the config file
+ConfigCacheKey = tuple[int, str, int, int]
+# parsed config files, in memory and across runs
+_CFG_CACHE: dict[ConfigCacheKey, ConfigValues] = {}
+_CFG_CACHE_FILE = Path.home() / ".cache" / "caldav2org" / "config.pkl"
+
+
+@dataclass(slots=True)
 class Config:
     """Config data (creditentials, files, ...)
 
@@ -26,6 +68,9 @@ class Config:
     meetings: keywords in meetings' titles
     days: how many days in the future to retrieve meetings
     calendars: a map of calendar names and shorter names.
+    meeting_re: compiled alternation of meetings
+    automaton: Aho-Corasick automaton over meetings (needs pyahocorasick)
+    freebusy: only retrieve busy periods of the calendars, not meetings
     """
 
     result_file: Path = field(init=False, repr=False)
@@ -41,14 +86,44 @@ class Config:
     calendars: dict[str, str] = field(init=False, default_factory=dict)
     # How many days in the future
     days: int = field(init=False, default=14)
+    meeting_re: Optional[re.Pattern] = field(init=False, default=None, repr=False)
+    automaton: Any = field(init=False, default=None, repr=False)
+    freebusy: bool = field(init=False, default=False)
 
-    def set_default_variables(self) -> tuple[str, str, Path, list, list]:
+    def set_default_variables(self) -> ConfigValues:
         """init Config's username, password & result_file"""
 
         if not self.config_file.exists():
             logging.error(f"{self.config_file} does not exist")
             raise FileNotFoundError
 
+        stat = self.config_file.stat()
+        key = (
+            _CFG_CACHE_VERSION,
+            str(self.config_file),
+            stat.st_mtime_ns,
+            stat.st_size,
+        )
+        values = _CFG_CACHE.get(key) or load_config_cache(key)
+        if values is None:
+            values = self.parse_config_file()
+            save_config_cache(key, values)
+
+        _CFG_CACHE[key] = values
+        username, password, result_file, myMeetings, aliases, freebusy = values
+        # copies, so that the cached values stay untouched
+        return (
+            username,
+            password,
+            result_file,
+            list(myMeetings),
+            list(aliases),
+            freebusy,
+        )
+
+    def parse_config_file(self) -> ConfigValues:
+        """read username, password, result_file, meetings, aliases & freebusy"""
+
         try:
             confParser = configparser.ConfigParser()
             confParser.read(self.config_file)
@@ -61,18 +136,8 @@ class Config:
         result_file = Path(confParser["calendar"]["result_file"])
         myMeetings = confParser.get("my", "meetings").split(",\n")
         aliases = confParser.get("my", "alias").split(",\n")
-        return (username, password, result_file, myMeetings, aliases)
-
-    def touch_file(self, filepath: Path) -> None:
-        """Touch result file. Delete if exists"""
-
-        if filepath.exists():
-            logging.info(f"file {filepath} exists. Delete")
-            filepath.unlink()
-            logging.info(f"check existance: {filepath.exists()}")
-
-        logging.info(f"Touch : {filepath}")
-        Path.touch(filepath)
+        freebusy = confParser.getboolean("my", "freebusy", fallback=False)
+        return (username, password, result_file, myMeetings, aliases, freebusy)
 
     def __post_init__(self) -> None:
         (
@@ -81,16 +146,62 @@ class Config:
             self.result_file,
             self.meetings,
             aliases,
+            self.freebusy,
         ) = self.set_default_variables()
-        self.touch_file(self.result_file)
         for alias in aliases:
+            if not alias.strip():
+                continue
+
             alias_list = alias.split(":")
             key = alias_list[0].strip()
             value = alias_list[1].strip()
             self.calendars[key] = value
 
+        if self.meetings:
+            self.meeting_re = re.compile("|".join(map(re.escape, self.meetings)))
+
+        if ahocorasick is not None and self.meetings and all(self.meetings):
+            self.automaton = ahocorasick.Automaton()
+            for keyword in self.meetings:
+                self.automaton.add_word(keyword, keyword)
+
+            self.automaton.make_automaton()
+
+
+def load_config_cache(key: ConfigCacheKey) -> Optional[ConfigValues]:
+    """return config values cached on disk for key, None if stale or missing"""
+
+    try:
+        with open(_CFG_CACHE_FILE, "rb") as cache_file:
+            cached_key, values = pickle.load(cache_file)
+    except Exception as e:
+        logging.debug(f"No usable config cache {_CFG_CACHE_FILE}: {e}")
+        return None
+
+    # set_default_variables unpacks the six ConfigValues
+    if cached_key != key or not isinstance(values, tuple) or len(values) != 6:
+        return None
+
+    return values
+
+
+def save_config_cache(key: ConfigCacheKey, values: ConfigValues) -> None:
+    """cache config values on disk, readable by the user only"""
+
+    try:
+        _CFG_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        write_file(_CFG_CACHE_FILE, pickle.dumps((key, values)), mode=0o600)
+    except OSError as e:
+        logging.warning(f"Could not write config cache {_CFG_CACHE_FILE}: {e}")
+
+
+class CalendarDataProp(NamedBaseElement):
+    """<C:prop name="..."/> of a calendar-data element (RFC 4791, 9.6.4)"""
 
-@dataclass
+    tag = ns("C", "prop")
+
+
+@dataclass(slots=True)
 class Meeting:
     """Definition of a Meeting."""
 
@@ -98,28 +209,66 @@ class Meeting:
     org_start: str = field(init=False)
     summary: str
     calendar_name: str
+    # day events start on a naive date, see parse_event_fields
+    is_day: bool = False
 
     def __post_init__(self) -> None:
-        # Should be Europe/Berlin!
-        self.org_start = org_datetime(self.start, tz=pytz.timezone("Europe/Sofia"))
+        date_format = _DAY_FORMAT if self.is_day else _ICS_FORMAT
+        self.org_start = org_datetime(self.start, tz=_TZ, date_format=date_format)
 
 
+# expanded recurring events share the same start strings
+@lru_cache(maxsize=4096)
 def org_datetime(
     start: str,
     tz: Optional[tzinfo] = None,
-    org_format: str = "<%Y-%m-%d %a %H:%M>",
-    date_format: str = "%Y%m%dT%H%M%S%fZ",
+    org_format: str = _ORG_FORMAT,
+    date_format: str = _ICS_FORMAT,
     diff_days: int = 0,
 ) -> str:
     """Convert String to date"""
 
-    dt = datetime.strptime(start, date_format)
+    dt = None
+    if date_format == _ICS_FORMAT and len(start) >= 16:
+        # Fast path for the fixed CalDAV format YYYYMMDDTHHMMSS[ffffff]Z,
+        # which is UTC by definition.
+        if start[8] == "T" and start[-1] == "Z":
+            try:
+                dt = datetime(
+                    int(start[0:4]),
+                    int(start[4:6]),
+                    int(start[6:8]),
+                    int(start[9:11]),
+                    int(start[11:13]),
+                    int(start[13:15]),
+                    0,
+                    tzinfo=timezone.utc,
+                )
+            except ValueError:
+                dt = None
+
+    elif date_format == _DAY_FORMAT and len(start) == 8 and start.isdigit():
+        # Fast path for the dates of day events: naive, as strptime returns
+        try:
+            dt = datetime(int(start[0:4]), int(start[4:6]), int(start[6:8]))
+        except ValueError:
+            dt = None
+
+    if dt is None:
+        dt = datetime.strptime(start, date_format)
     if diff_days:
         # for some unknown reason, caldav returns  the last day of day-events PLUS 1
         # So we have to substruct 1 day to get the right day!
         dt = dt - timedelta(days=diff_days)
 
-    return dt.astimezone(tz).strftime(org_format)
+    dt = dt.astimezone(tz)
+    if org_format == _ORG_FORMAT:
+        return (
+            f"<{dt.year:04d}-{dt.month:02d}-{dt.day:02d} "
+            f"{_WEEKDAYS[dt.weekday()]} {dt.hour:02d}:{dt.minute:02d}>"
+        )
+
+    return dt.strftime(org_format)
 
 
 def get_principle(config: Config) -> caldav.objects.Principal:
@@ -131,143 +280,342 @@ def get_principle(config: Config) -> caldav.objects.Principal:
     client = caldav.DAVClient(
         url=caldav_url, username=config.username, password=config.password
     )
+    # main fetches the calendars concurrently: keep a connection per calendar
+    # alive instead of urllib3 discarding the ones beyond its default pool size
+    pool_size = max(1, len(config.calendars))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    client.session.mount("https://", adapter)
     logging.info("Done!")
     return client.principal()
 
 
+def build_meetings_query(
+    start_time: datetime, end_time: datetime
+) -> cdav.CalendarQuery:
+    """Expanded VEVENT query in time interval returning only _EVENT_PROPS"""
+
+    vevent = cdav.Comp("VEVENT") + [CalendarDataProp(p) for p in _EVENT_PROPS]
+    data = cdav.CalendarData() + [
+        cdav.Comp("VCALENDAR") + vevent,
+        cdav.Expand(start_time, end_time),
+    ]
+    time_range = cdav.CompFilter("VEVENT") + cdav.TimeRange(start_time, end_time)
+    return cdav.CalendarQuery() + [
+        dav.Prop() + data,
+        cdav.Filter() + (cdav.CompFilter("VCALENDAR") + time_range),
+    ]
+
+
 def fetch_calendar_meetings(
     calendar: caldav.Calendar, start_time: datetime, end_time: datetime
-) -> list[caldav.Event]:
-    """Fetch all events from calendar in time interval"""
+) -> Optional[list[caldav.Event]]:
+    """Fetch all events from calendar in time interval, None on failure"""
 
     logging.info(f"Get events from {start_time} to {end_time}")
     events_fetched = []
     try:
-        events_fetched = calendar.date_search(
-            start=start_time,
-            end=end_time,
-            expand=True,
+        found = calendar.search(
+            xml=build_meetings_query(start_time, end_time), comp_class=caldav.Event
         )
+        for event in found:
+            # servers ignoring <C:expand> return the recurring masters
+            data = event.data
+            if any(f"\n{prop}" in data for prop in _RECURRENCE_PROPS):
+                events_fetched += expand_meeting(event, start_time, end_time)
+                continue
+
+            # and single events in their local time
+            if "\nDTSTART;TZID=" in data:
+                set_utc_start(event)
+
+            events_fetched.append(event)
 
     except Exception as e:
         logging.critical(
             f"""Calendar server does not support expanded search.
             Error: {e}"""
         )
+        return None
 
     return events_fetched
 
 
-def add_meeting(meetings: defaultdict[str, list[Meeting]], meeting: Meeting) -> None:
-    """Add meeting if I am supposed to participate in it"""
+def expand_meeting(
+    event: caldav.Event, start_time: datetime, end_time: datetime
+) -> list[caldav.Event]:
+    """Expand a recurring event client-side, like date_search(expand=True)
 
-    for m in config.meetings:
-        if m in meeting.summary:
-            logging.debug(
-                f">> {meeting.summary} at {meeting.org_start} - {meeting.start}"
-            )
-            meetings[meeting.start].append(meeting)
+    As with server-side expansion, the occurrences start in UTC.
+    """
 
+    event.expand_rrule(start_time, end_time)
+    set_utc_start(event)
+    return event.split_expanded()
 
-def is_day_event(event: caldav.objects.Event) -> bool:
-    """returns true if this event spands across a whole day or several days"""
 
-    if "DTSTART;VALUE=DATE:" in event.data:
-        return True
+def set_utc_start(event: caldav.Event) -> None:
+    """Convert the timed DTSTART of each VEVENT of event to UTC"""
 
-    return False
+    for vevent in event.icalendar_instance.walk("VEVENT"):
+        dtstart = vevent["DTSTART"].dt
+        if isinstance(dtstart, datetime) and dtstart.tzinfo is not None:
+            vevent.pop("DTSTART")
+            vevent.add("DTSTART", dtstart.astimezone(timezone.utc))
 
 
-def get_meeting_day_span(event: caldav.objects.Event) -> tuple[str, str]:
-    """For day events return starting day and end day of meeting"""
+def fetch_calendar_busy(
+    calendar: caldav.Calendar, start_time: datetime, end_time: datetime
+) -> Optional[list[tuple[datetime, datetime]]]:
+    """Fetch busy periods (start, end) of calendar in time interval, None on failure"""
 
-    start_day = event.data.split("DTSTART;VALUE=DATE:")[-1].split("\n")[0].strip()
-    end_day = event.data.split("DTEND;VALUE=DATE:")[-1].split("\n")[0].strip()
-    return (str(start_day), str(end_day))
+    logging.info(f"Get busy periods from {start_time} to {end_time}")
+    periods: list[tuple[datetime, datetime]] = []
+    try:
+        freebusy = calendar.freebusy_request(start_time, end_time)
+    except Exception as e:
+        logging.critical(
+            f"""Calendar server does not support free-busy queries.
+            Error: {e}"""
+        )
+        return None
 
+    # icalendar unfolds the lines and splits the comma-separated periods
+    for component in freebusy.icalendar_instance.walk("VFREEBUSY"):
+        values = component.get("FREEBUSY", [])
+        if not isinstance(values, list):
+            values = [values]
 
-def get_start(event: caldav.objects.Event) -> str:
-    """retrieve start of the meeting"""
-    logging.debug("get_start ---------------\n")
-    start = ""
-    if "DTSTART:" in event.data:
-        temptative_start = event.data.split("DTSTART:")
-        logging.debug(f"tempative {temptative_start}")
-        if temptative_start:
-            start = temptative_start[-1].split("\n")[0].strip()
-        else:
-            logging.error(f"Something is wrong with this meeting!\n{event.data}")
+        for period in values:
+            if period.params.get("FBTYPE") == "FREE":
+                continue
 
-    elif is_day_event(event):
-        start = event.data.split("DTSTART;VALUE=DATE:")[-1].split("\n")[0].strip()
-        start += "T000000Z"
+            periods.append((period.start, period.end))
 
-    logging.debug(f"get start return: {start}\n---------\n")
-    return str(start)
+    return periods
 
 
-def get_summary(event: caldav.objects.Event) -> str:
-    """retrieve title of the meeting"""
+def get_busy_meetings(
+    periods: list[tuple[datetime, datetime]], calendar_name: str
+) -> list[Meeting]:
+    """return a meeting for each busy period (start, end)"""
 
-    summary = event.data.split("SUMMARY:")[-1].split("\n")[0].strip()
-    if is_day_event(event):
-        start_day, end_day = get_meeting_day_span(event)
-        summary += ". From: " + org_datetime(
-            start_day, date_format="%Y%m%d", org_format="<%Y-%m-%d %a>"
+    meetings = []
+    for start, end in periods:
+        # back to the UTC CalDAV format that Meeting and org_datetime expect
+        start_ics = start.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        end_ics = end.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        summary = "Busy To: " + org_datetime(end_ics, tz=_TZ)
+        meetings.append(
+            Meeting(start=start_ics, summary=summary, calendar_name=calendar_name)
         )
-        summary += " To: " + org_datetime(
-            end_day, date_format="%Y%m%d", org_format="<%Y-%m-%d %a>", diff_days=1
+
+    return meetings
+
+
+def is_my_meeting(summary: str) -> bool:
+    """returns true if summary contains one of my meetings' keywords"""
+
+    if config.automaton is not None:
+        return next(config.automaton.iter(summary), None) is not None
+
+    if config.meeting_re is None:
+        return False
+
+    return config.meeting_re.search(summary) is not None
+
+
+def get_field(data: str, name: str) -> tuple[int, str]:
+    """position and value of the last `name:` line in data, (-1, "") if missing"""
+
+    pos = data.rfind(f"\n{name}:")
+    if pos == -1:
+        return (-1, "")
+
+    return (pos, get_line_rest(data, pos + len(name) + 2))
+
+
+def get_line_rest(data: str, begin: int) -> str:
+    """stripped rest of the line starting at index begin of data"""
+
+    end = data.find("\n", begin)
+    if end == -1:
+        end = len(data)
+
+    return data[begin:end].strip()
+
+
+def parse_event_fields(data: str) -> dict[str, Any]:
+    """Extract uid, start and summary of an event and whether it is a day event
+
+    Each field is located with one str.rfind, both forms of DTSTART included.
+    The last occurrence wins, so the VEVENT overrides e.g. the DTSTART of a
+    preceding VTIMEZONE.
+    """
+
+    _, uid = get_field(data, "UID")
+    _, summary = get_field(data, "SUMMARY")
+    # one scan finds both DTSTART:<timestamp> and DTSTART;VALUE=DATE:<date>
+    pos = data.rfind("\nDTSTART")
+    start = ""
+    # day events span across a whole day or several days
+    is_day = pos != -1 and data.startswith(";VALUE=DATE:", pos + 8)
+    if is_day:
+        # a naive date, not UTC: it sorts before the day's timed starts
+        start = get_line_rest(data, pos + 20)
+        summary += ". From: " + org_datetime(
+            start, date_format=_DAY_FORMAT, org_format=_ORG_DAY_FORMAT
         )
+        _, end_day = get_field(data, "DTEND;VALUE=DATE")
+        if end_day:
+            summary += " To: " + org_datetime(
+                end_day,
+                date_format=_DAY_FORMAT,
+                org_format=_ORG_DAY_FORMAT,
+                diff_days=1,
+            )
+    elif pos != -1 and data.startswith(":", pos + 8):
+        start = get_line_rest(data, pos + 9)
+    else:
+        logging.error(f"Something is wrong with this meeting!\n{data}")
 
-    return str(summary)
+    return {"uid": uid, "start": start, "summary": summary, "is_day": is_day}
 
 
 def get_my_meetings(
-    events_fetched: list[caldav.Event],
-) -> defaultdict[str, list[Meeting]]:
+    events_fetched: Iterable[caldav.Event],
+) -> list[Meeting]:
     """return relevant meetings (cal_name, org_start, summary)"""
 
-    meetings: defaultdict[str, list[Meeting]] = defaultdict(list[Meeting])
+    meetings: list[Meeting] = []
+    append = meetings.append
+    calendars = config.calendars
+    # events shared between calendars are fetched once per calendar
+    seen: set[tuple[str, str]] = set()
     for event in events_fetched:
-        logging.info(f"{event.data}\n---------")
-        cal_name = str(event.parent)
-        calendar_name = config.calendars[cal_name]
-        start = get_start(event)
-        summary = get_summary(event)
-        meeting = Meeting(start=start, summary=summary, calendar_name=calendar_name)
-        add_meeting(meetings, meeting)
+        # caldav rebuilds (decodes, normalizes newlines) event.data per access
+        data = event.data
+        logging.debug("%s\n---------", data)
+        fields = parse_event_fields(data)
+        summary = fields["summary"]
+        # only convert the start of meetings I am supposed to participate in
+        if not is_my_meeting(summary):
+            continue
+
+        start = fields["start"]
+        # parse_event_fields already logged the event without a usable DTSTART
+        if not start:
+            continue
+
+        if fields["uid"]:
+            if (fields["uid"], start) in seen:
+                continue
+
+            seen.add((fields["uid"], start))
+
+        # the display name known from listing the calendars, whereas
+        # str(event.parent) asks the server for it
+        cal_name = event.parent.name or str(event.parent)
+        calendar_name = calendars[cal_name]
+        meeting = Meeting(
+            start=start,
+            summary=summary,
+            calendar_name=calendar_name,
+            is_day=fields["is_day"],
+        )
+        logging.debug(">> %s at %s - %s", summary, meeting.org_start, start)
+        append(meeting)
 
     return meetings
 
 
-def dump_in_file(meetings: defaultdict[str, list[Meeting]]) -> None:
+def dump_in_file(meetings: list[Meeting]) -> None:
     """Format meetings in an org-file and write in org_file"""
 
     logging.info(f"Dump meetings in {config.result_file}")
-    content = ""
-    for key in sorted(meetings.keys()):
-        for meeting in meetings[key]:
-            title = meeting.summary.replace("\\", " ")
-            content += f"* {meeting.calendar_name}\n"
-            content += f"** CAL {meeting.org_start}, {title}\n"
-            content += f"DEADLINE: {meeting.org_start}\n"
+    parts: list[str] = []
+    append = parts.append
+    for meeting in sorted(meetings, key=attrgetter("start")):
+        title = meeting.summary.replace("\\", " ")
+        append(
+            _ORG_ENTRY
+            % (meeting.calendar_name, meeting.org_start, title, meeting.org_start)
+        )
+
+    write_file(config.result_file, "".join(parts).encode("utf-8"))
 
-    config.result_file.write_text(f"{content}")
+
+def write_file(filepath: Path, data: bytes, mode: int = 0o644) -> None:
+    """Atomically replace filepath with data, written with raw os.write calls"""
+
+    # a crash while writing leaves the previous file intact
+    tmp_file = filepath.with_suffix(filepath.suffix + ".tmp")
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+    os.replace(tmp_file, filepath)
 
 
 def main(my_principal: caldav.objects.Principal) -> None:
     """Init calender, fetch meetings, filter my meetings, dump in org-file"""
 
-    events_fetched = []
+    if not config.calendars:
+        logging.info("No calendars configured; leaving result file untouched")
+        return
+
     today = datetime.now()
     end = today + timedelta(days=config.days)
-    for calendar_name in config.calendars:
-        logging.info(f"process calender <{calendar_name}>")
-        calendar = my_principal.calendar(calendar_name)
-        events_fetched += fetch_calendar_meetings(calendar, today, end)
+    fetch = fetch_calendar_busy if config.freebusy else fetch_calendar_meetings
+    # principal.calendar(name) lists all calendars and asks each one for its
+    # display name, per lookup. One listing carries all display names.
+    calendars = {calendar.name: calendar for calendar in my_principal.calendars()}
+    futures = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(config.calendars))) as executor:
+        for calendar_name in config.calendars:
+            if calendar_name not in calendars:
+                logging.error(f"No calendar with name <{calendar_name}> found")
+                continue
+
+            logging.info(f"process calender <{calendar_name}>")
+            calendar = calendars[calendar_name]
+            futures[calendar_name] = executor.submit(fetch, calendar, today, end)
+
+        if not futures:
+            logging.info(
+                "No configured calendar found; leaving result file untouched"
+            )
+            return
+
+        # keep the calendars' order, and process each calendar's results as
+        # soon as they arrive while the later ones are still being fetched
+        if config.freebusy:
+            meetings = []
+            for calendar_name, future in futures.items():
+                calendar_alias = config.calendars[calendar_name]
+                meetings += get_busy_meetings(future.result() or [], calendar_alias)
+
+            logging.info(f"Got {len(meetings)} busy periods.")
+        else:
+            per_calendar = (future.result() or [] for future in futures.values())
+            meetings = get_my_meetings(chain.from_iterable(per_calendar))
+            events_count = sum(
+                len(future.result() or []) for future in futures.values()
+            )
+            logging.info(f"Got {len(meetings)} from {events_count} events.")
+
+    # the fetchers log their failure, and the meetings of a failed calendar
+    # would be missing from the org file
+    failed = [name for name, future in futures.items() if future.result() is None]
+    if failed:
+        logging.error(
+            f"Could not fetch calendars {failed}; leaving result file untouched"
+        )
+        return
 
-    meetings = get_my_meetings(events_fetched)
-    logging.info(f"Got {len(meetings)} from {len(events_fetched)} events.")
     dump_in_file(meetings)
 
 